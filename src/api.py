@@ -64,8 +64,11 @@ async def root():
     return {"status": "Genesis System Online"}
 
 
+# pymongo and the simulation are blocking, so these routes are plain `def`:
+# FastAPI runs them in its threadpool instead of stalling the event loop.
+
 @app.get("/current-quest")
-async def get_quest():
+def get_quest():
     """Fetches the latest quest from the cloud database."""
     if collection is None:
         return {"error": "Database not connected"}
@@ -76,12 +79,35 @@ async def get_quest():
 
 
 @app.post("/run-simulation")
-async def run_sim():
+def run_sim():
     """Triggers the AI simulation engine."""
     try:
         # This imports the logic from your src folder
-        from src.main import run_economic_cycle
-        result = run_economic_cycle()
+        from src.main import run_simulation_cycle
+        result = run_simulation_cycle()
+        return {"status": "Success", "data": result}
+    except Exception as e:
+        print(f"ERROR: {e}")
+        return {"status": "Error", "message": str(e)}
+
+
+@app.post("/sensitivity")
+def sensitivity(request: dict):
+    """
+    What-If analysis over the policy engine.
+    Body: {"ranges": {"tax_cap": {"start": 0.1, "stop": 0.9, "steps": 9}, ...},
+           "base": {"gold_rush_intensity": 5}, "inflation_limit": 10}
+    Plain `def` so FastAPI runs the grid in its threadpool instead of the event loop.
+    Grids are capped at sensitivity.MAX_GRID_POINTS.
+    """
+    try:
+        from src.sensitivity import evaluate_grid
+        result = evaluate_grid(
+            request.get("ranges", {}),
+            base=request.get("base"),
+            inflation_limit=request.get("inflation_limit", 10.0),
+            workers=1,  # No process pools forked from the server's threads
+        )
         return {"status": "Success", "data": result}
     except Exception as e:
         print(f"ERROR: {e}")
@@ -1,44 +1,61 @@
+# Control parameters for each strategy:
+# - upper_band / lower_band: money supply (as a multiple of target) that triggers action
+# - raise_step / cut_step: how far the tax moves per decision
+# - tax_cap / tax_floor: hard limits on the tax rate
+STRATEGY_PROFILES = {
+    # --- STRATEGY 1: THE HAWK (Aggressive) ---
+    # Panic Early: If inflation > 1%, slam the brakes (+15% Tax instantly).
+    # Below target it drops straight to the floor.
+    "Hawk": {"upper_band": 1.01, "lower_band": 0.99, "raise_step": 0.15, "cut_step": 1.0,
+             "tax_cap": 0.90, "tax_floor": 0.01},
+
+    # --- STRATEGY 2: THE DOVE (Passive) ---
+    # Wait until inflation is HUGE (>50%) before doing anything, then TINY STEPS (+0.1%).
+    "Dove": {"upper_band": 1.50, "lower_band": 0.90, "raise_step": 0.001, "cut_step": 0.01,
+             "tax_cap": 0.20, "tax_floor": 0.01},
+
+    # --- STRATEGY 3: BALANCED (Standard) ---
+    # The Goldilocks Zone: Moderate Ramp (+2% Tax).
+    "Balanced": {"upper_band": 1.10, "lower_band": 0.90, "raise_step": 0.02, "cut_step": 0.01,
+                 "tax_cap": 0.50, "tax_floor": 0.01},
+}
+
+
 class CentralBankAI:
     """
     The Automated Regulator.
     Monitors the Economy and adjusts Tax Rates using Control Theory (PID-like logic).
+    Any of the STRATEGY_PROFILES parameters can be overridden by keyword,
+    e.g. CentralBankAI("Balanced", tax_cap=0.30).
     """
 
-    def __init__(self, strategy="Balanced"):
+    def __init__(self, strategy="Balanced", **overrides):
         self.strategy = strategy
 
+        if "Hawk" in strategy:
+            profile = STRATEGY_PROFILES["Hawk"]
+        elif "Dove" in strategy:
+            profile = STRATEGY_PROFILES["Dove"]
+        else:
+            profile = STRATEGY_PROFILES["Balanced"]
+
+        unknown = set(overrides) - set(profile)
+        if unknown:
+            raise ValueError(f"Unknown policy parameter(s): {', '.join(sorted(unknown))}")
+
+        self.params = {**profile, **overrides}
+
     def decide_policy(self, economy):
         """
         Analyzes the Money Supply and returns the new Tax Rate.
         """
         current = economy.money_supply
         target = economy.inflation_target
+        p = self.params
 
-        # --- STRATEGY 1: THE HAWK (Aggressive) ---
-        if "Hawk" in self.strategy:
-            # Panic Early: If inflation > 1%, slam the brakes
-            if current > target * 1.01:
-                # VIOLENT BRAKING: +15% Tax instantly
-                economy.tax_rate = min(0.90, economy.tax_rate + 0.15)
-            elif current < target * 0.99:
-                economy.tax_rate = 0.01
-
-        # --- STRATEGY 2: THE DOVE (Passive) ---
-        elif "Dove" in self.strategy:
-            # Wait until inflation is HUGE (>50%) before doing anything
-            if current > target * 1.50:
-                # TINY STEPS: +0.1% Tax only
-                economy.tax_rate = min(0.20, economy.tax_rate + 0.001)
-            elif current < target * 0.90:
-                economy.tax_rate = max(0.01, economy.tax_rate - 0.01)
-
-        # --- STRATEGY 3: BALANCED (Standard) ---
-        else:
-            # The Goldilocks Zone
-            if current > target * 1.10:
-                # Moderate Ramp: +2% Tax
-                economy.tax_rate = min(0.50, economy.tax_rate + 0.02)
-            elif current < target * 0.90:
-                economy.tax_rate = max(0.01, economy.tax_rate - 0.01)
+        if current > target * p["upper_band"]:
+            economy.tax_rate = min(p["tax_cap"], economy.tax_rate + p["raise_step"])
+        elif current < target * p["lower_band"]:
+            economy.tax_rate = max(p["tax_floor"], economy.tax_rate - p["cut_step"])
 
         return economy.tax_rate
\ No newline at end of file
@@ -6,12 +6,16 @@ class Economy:
     Tracks Money Supply (Inflation) and handles transactions.
     """
 
-    def __init__(self, start_money=100_000_000, start_tax=0.05):
+    def __init__(self, start_money=100_000_000, start_tax=0.05, seed=None):
         self.money_supply = start_money
         self.tax_rate = start_tax
         self.inflation_target = 100_000_000  # The "Healthy" baseline
         self.inflation_rate = 0.0
 
+        # Private RNG so a run can be seeded, checkpointed and replayed
+        # without touching the global `random` state.
+        self.rng = random.Random(seed)
+
     def transaction(self, volume):
         """
         Simulates player trade volume.
@@ -32,7 +36,7 @@ class Economy:
         """
         # 1. Simulate random market activity (Farming vs Taxes)
         # Growth factor between 0.98 (Recession) and 1.15 (Boom)
-        growth_factor = random.uniform(0.98, 1.15)
+        growth_factor = self.rng.uniform(0.98, 1.15)
         self.money_supply = int(self.money_supply * growth_factor)
 
         # 2. Calculate Inflation
@@ -46,4 +50,16 @@ class Economy:
             "money_supply": self.money_supply,
             "inflation_rate": self.inflation_rate,
             "tax_rate": self.tax_rate
-        }
\ No newline at end of file
+        }
+
+
+def diagnose_state(inflation_rate):
+    """
+    Classifies an inflation rate into the condition the Quest AI reacts to.
+    Returns (condition, severity, sentiment).
+    """
+    if inflation_rate > 5.0:
+        return "Hyper-Inflation", 8, "Panic"
+    elif inflation_rate < -2.0:
+        return "Deflationary Spiral", 7, "Depression"
+    return "Stable", 0, "Happy"
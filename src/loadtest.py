@@ -0,0 +1,203 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+
+from src.stubs import FakeGeminiClient, InMemoryCollection
+
+# (method, path, json body) driven by default
+DEFAULT_ENDPOINTS = [
+    ("GET", "/current-quest", None),
+    ("POST", "/run-simulation", None),
+    ("POST", "/sensitivity", {"ranges": {"tax_cap": {"start": 0.1, "stop": 0.9, "steps": 9},
+                                         "raise_step": {"start": 0.01, "stop": 0.1, "steps": 10}},
+                              "base": {"daily_print": 1_000_000, "gold_rush_intensity": 5}}),
+]
+
+SEED_QUEST = {
+    "title": "The Load Tester's Tithe",
+    "flavor_text": "A quest planted so /current-quest has something to return.",
+    "objective": "Deposit 1,000 Gold into the Void Bank.",
+    "reward": "Benchmark Token",
+    "type": "Gold Sink",
+}
+
+
+def install_stand_ins(gemini_latency=0.2, gemini_error_rate=0.0, db_latency=0.0, pool_size=100,
+                      pool_wait_timeout=1.0, seed=None):
+    """
+    Swaps the live MongoDB and Gemini connections for local stand-ins.
+    Returns the FastAPI app and the shared in-memory collection.
+    """
+    from src import api, quest_generator
+
+    collection = InMemoryCollection(latency=db_latency, pool_size=pool_size, wait_timeout=pool_wait_timeout)
+    collection.insert_one(dict(SEED_QUEST))
+
+    api.collection = collection
+    quest_generator.db_collection = collection
+    quest_generator.client = FakeGeminiClient(latency=gemini_latency, error_rate=gemini_error_rate, seed=seed)
+    # Keep generated quest files out of the real archive
+    quest_generator.QUESTS_DIR = tempfile.mkdtemp(prefix="genesis_loadtest_")
+
+    return api.app, collection
+
+
+def percentile(sorted_values, pct):
+    """ Nearest-rank percentile of an already sorted list. """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies, errors, elapsed):
+    """ Latency percentiles (ms) and throughput for one endpoint. """
+    ordered = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 1),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 1),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 1),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 1) if ordered else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def is_error(response):
+    """
+    HTTP failures, the app's own {"error": ...} / {"status": "Error"} replies,
+    and simulations that only produced the emergency fallback quest (Gemini down).
+    """
+    if response.status_code >= 400:
+        return True
+    try:
+        body = response.json()
+    except ValueError:
+        return True
+    if not isinstance(body, dict):
+        return False
+    if "error" in body or body.get("status") == "Error":
+        return True
+
+    quest = (body.get("data") or {}).get("quest") if isinstance(body.get("data"), dict) else None
+    return isinstance(quest, dict) and quest.get("type") == "Fallback Mechanism"
+
+
+async def monitor_loop_lag(stop, interval=0.01):
+    """
+    Heartbeat that measures how late the event loop wakes up.
+    Large values mean a route is blocking the loop with synchronous work.
+    """
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def drive_endpoint(client, method, path, body, requests, concurrency):
+    """
+    Closed loop: `concurrency` virtual clients share `requests` calls, each
+    sending its next request as soon as the previous one completes.
+    Latency runs from send to completion of each request.
+    """
+    pending = iter(range(requests))
+    latencies = []
+    errors = 0
+
+    async def virtual_client():
+        nonlocal errors
+        for _ in pending:
+            sent = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                failed = is_error(response)
+            except Exception:
+                failed = True
+            latencies.append(time.perf_counter() - sent)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_client() for _ in range(min(concurrency, requests))))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def run_load_test_async(app, endpoints, requests, concurrency):
+    report = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://genesis.loadtest", timeout=None) as client:
+        for method, path, body in endpoints:
+            stop = asyncio.Event()
+            lag_task = asyncio.create_task(monitor_loop_lag(stop))
+
+            result = await drive_endpoint(client, method, path, body, requests, concurrency)
+
+            stop.set()
+            result["max_loop_lag_ms"] = round(await lag_task * 1000, 1)
+            name = f"{method} {path}"
+            if name in report:
+                # Same route with a different body
+                name = f"{name} #{sum(key.startswith(name) for key in report) + 1}"
+            report[name] = result
+    return report
+
+
+def run_load_test(endpoints=None, requests=200, concurrency=20, gemini_latency=0.2,
+                  gemini_error_rate=0.0, db_latency=0.0, pool_size=100, pool_wait_timeout=1.0,
+                  seed=None, quiet=True):
+    """
+    Runs the whole harness and returns {"METHOD /path": stats}.
+    """
+    app, _ = install_stand_ins(gemini_latency, gemini_error_rate, db_latency, pool_size, pool_wait_timeout, seed)
+
+    # The simulation is chatty; swallow its prints so the report stays readable
+    output = io.StringIO() if quiet else sys.stdout
+    with contextlib.redirect_stdout(output):
+        return asyncio.run(run_load_test_async(app, endpoints or DEFAULT_ENDPOINTS, requests, concurrency))
+
+
+def parse_endpoint(text):
+    """ 'POST:/path' or 'POST:/path:{"json": "body"}' -> (method, path, body) """
+    method, path, *body = text.split(":", 2)
+    return method.upper(), path, json.loads(body[0]) if body else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the Genesis FastAPI backend in-process.")
+    parser.add_argument("--endpoint", action="append", type=parse_endpoint,
+                        help="METHOD:/path[:json-body], repeatable (default: /current-quest, /run-simulation and /sensitivity)")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--gemini-latency", type=float, default=0.2, help="Seconds per fake Gemini call")
+    parser.add_argument("--gemini-error-rate", type=float, default=0.0, help="Fraction of Gemini calls that fail with 503")
+    parser.add_argument("--db-latency", type=float, default=0.0, help="Seconds per in-memory Mongo operation")
+    parser.add_argument("--pool-size", type=int, default=100, help="Simulated Mongo connection pool size")
+    parser.add_argument("--pool-wait-timeout", type=float, default=1.0,
+                        help="Seconds a request waits for a pooled connection before failing")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--verbose", action="store_true", help="Show the app's own console output")
+    args = parser.parse_args()
+
+    report = run_load_test(args.endpoint, args.requests, args.concurrency, args.gemini_latency,
+                           args.gemini_error_rate, args.db_latency, args.pool_size,
+                           args.pool_wait_timeout, args.seed, quiet=not args.verbose)
+
+    print(f"\n📈 LOAD TEST ({args.requests} requests/endpoint, concurrency {args.concurrency})")
+    for name, stats in report.items():
+        print(f"\n{name}")
+        for key, value in stats.items():
+            print(f"   - {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
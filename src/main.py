@@ -1,6 +1,14 @@
 import time
-from economy import Economy  # <--- FIXED IMPORT
-from quest_generator import QuestGenerator
+try:
+    # Imported as part of the package (e.g. by src/api.py)
+    from src.economy import Economy, diagnose_state
+    from src.quest_generator import QuestGenerator
+    from src.pipeline import QuestPipeline
+except ImportError:
+    # Run directly as a script from inside src/
+    from economy import Economy, diagnose_state  # <--- FIXED IMPORT
+    from quest_generator import QuestGenerator
+    from pipeline import QuestPipeline
 
 
 def run_simulation_cycle():
@@ -29,22 +37,12 @@ def run_simulation_cycle():
     print(f"   - Tax Rate: {stats['tax_rate'] * 100:.1f}%")
 
     # 3. Analyze the Condition
-    if stats['inflation_rate'] > 5.0:
-        condition = "Hyper-Inflation"
-        severity = 8
-        sentiment = "Panic"
-    elif stats['inflation_rate'] < -2.0:
-        condition = "Deflationary Spiral"
-        severity = 7
-        sentiment = "Depression"
-    else:
-        condition = "Stable"
-        severity = 0
-        sentiment = "Happy"
+    condition, severity, sentiment = diagnose_state(stats['inflation_rate'])
 
     print(f"\n🔍 STEP 2: Diagnosing State -> {condition.upper()}")
 
     # 4. Trigger AI if needed
+    quest = None
     if condition != "Stable":
         print(f"   ⚠️ CRISIS DETECTED! Awakening the Grand Archivist...")
 
@@ -56,12 +54,10 @@ def run_simulation_cycle():
             "sentiment": sentiment
         }
 
-        # Generate and Save
+        # Generate and Save (generate_quest saves to Cloud AND Disk)
         quest = quest_bot.generate_quest(economy_state)
 
         if "error" not in quest:
-            # We call save_quest (which saves to Cloud AND Disk)
-            quest_bot.save_quest(quest)
             print(f"\n✅ ACTION TAKEN: Generated Quest '{quest['title']}'")
         else:
             print(f"\n❌ ERROR: {quest['error']}")
@@ -73,6 +69,39 @@ def run_simulation_cycle():
     print("🏁 CYCLE COMPLETE")
     print("=" * 50)
 
+    return {"stats": stats, "condition": condition, "quest": quest}
+
+
+def run_multi_crisis_cycle(regions=8, max_workers=4):
+    """
+    The Multi-Region Loop:
+    Steps several independent economies and sends every crisis through the
+    QuestPipeline, generating all quests for the cycle concurrently.
+    """
+    print("\n" + "=" * 50)
+    print(f"🚀 STARTING MULTI-REGION CYCLE ({regions} regions)")
+    print("=" * 50)
+
+    quest_bot = QuestGenerator()
+    pipeline = QuestPipeline(quest_bot, max_workers=max_workers)
+
+    states = []
+    for index in range(regions):
+        stats = Economy(start_money=150_000_000).update_economy()
+        stats["region"] = f"Region {index + 1}"
+        states.append(stats)
+
+    report = pipeline.run(states)
+
+    for item in report["quests"]:
+        print(f"✅ {', '.join(item['regions'])}: '{item['quest']['title']}'")
+
+    print(f"\n⏱️ {report['crises']} crises -> {report['generations']} generations")
+    for stage, seconds in report["timings"].items():
+        print(f"   - {stage}: {seconds:.2f}s")
+
+    return report
+
 
 if __name__ == "__main__":
     run_simulation_cycle()
\ No newline at end of file
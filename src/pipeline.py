@@ -0,0 +1,147 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    from src.economy import diagnose_state
+    from src.prompts import is_valid_quest
+except ImportError:
+    from economy import diagnose_state
+    from prompts import is_valid_quest
+
+
+class QuestPipeline:
+    """
+    The Assembly Line.
+    Turns many economy states (regions / scenarios) into quests in one cycle:
+    collect -> de-duplicate -> build prompts -> generate (concurrently) -> validate & persist.
+
+    Generation is fanned out over a bounded thread pool, so a whole cycle
+    takes roughly as long as the slowest single Gemini call.
+    """
+
+    def __init__(self, quest_generator, max_workers=4, inflation_bucket=5.0):
+        self.quest_generator = quest_generator
+        self.max_workers = max_workers
+        # Crises with the same condition/severity whose inflation falls in the
+        # same bucket (in % points) share one quest
+        self.inflation_bucket = inflation_bucket
+
+    # --- STAGE 1: COLLECT ---
+
+    def collect(self, states):
+        """
+        Diagnoses each stats dict (as returned by Economy.update_economy)
+        and keeps only the ones in crisis.
+        """
+        crises = []
+        for index, stats in enumerate(states):
+            condition, severity, sentiment = diagnose_state(stats["inflation_rate"])
+            if condition == "Stable":
+                continue
+            crises.append({
+                "region": stats.get("region", f"Region {index + 1}"),
+                "condition": condition,
+                "severity": severity,
+                "inflation": stats["inflation_rate"],
+                "sentiment": sentiment,
+                "money_supply": stats["money_supply"],
+            })
+        return crises
+
+    # --- STAGE 2: DE-DUPLICATE ---
+
+    def deduplicate(self, crises):
+        """
+        Groups similar crises so each group triggers a single generation.
+        Returns a list of (representative_state, [regions]).
+        """
+        groups = {}
+        for crisis in crises:
+            key = (
+                crisis["condition"],
+                crisis["severity"],
+                int(crisis["inflation"] // self.inflation_bucket),
+            )
+            if key not in groups:
+                groups[key] = (crisis, [])
+            groups[key][1].append(crisis["region"])
+        return list(groups.values())
+
+    # --- STAGE 5: VALIDATE ---
+
+    @staticmethod
+    def validate(quest):
+        """ True if the generator returned a usable quest object. """
+        return is_valid_quest(quest)
+
+    def _generate(self, prompt):
+        """ Worker: one cascade call, timed. """
+        start = time.perf_counter()
+        quest = self.quest_generator.request_quest(prompt)
+        return quest, time.perf_counter() - start
+
+    # --- THE FULL CYCLE ---
+
+    def run(self, states):
+        """
+        Runs every stage for one cycle.
+        Returns the persisted quests plus per-stage timings (seconds).
+        """
+        timings = {}
+        cycle_start = time.perf_counter()
+
+        start = time.perf_counter()
+        crises = self.collect(states)
+        timings["collect"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        groups = self.deduplicate(crises)
+        timings["deduplicate"] = time.perf_counter() - start
+
+        # --- STAGE 3: BUILD PROMPTS ---
+        start = time.perf_counter()
+        jobs = [(self.quest_generator.build_prompt(state), state, regions) for state, regions in groups]
+        timings["build_prompts"] = time.perf_counter() - start
+
+        # --- STAGE 4: GENERATE (fan-out) + STAGE 5: VALIDATE & PERSIST (as they complete) ---
+        results = []
+        call_latencies = []
+        persist_time = 0.0
+        invalid = 0   # The model answered, but not with a usable quest
+        failed = 0    # Every model in the cascade was unavailable
+
+        start = time.perf_counter()
+        if jobs:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {pool.submit(self._generate, prompt): (state, regions) for prompt, state, regions in jobs}
+
+                for future in as_completed(futures):
+                    state, regions = futures[future]
+                    quest, latency = future.result()
+                    call_latencies.append(latency)
+
+                    persist_start = time.perf_counter()
+                    if quest is None:
+                        failed += 1
+                        quest = self.quest_generator.fallback_quest()
+                    elif not self.validate(quest):
+                        invalid += 1
+                        quest = self.quest_generator.fallback_quest()
+                    self.quest_generator.save_quest(quest)
+                    persist_time += time.perf_counter() - persist_start
+
+                    results.append({"regions": regions, "state": state, "quest": quest})
+
+        timings["generate_and_persist"] = time.perf_counter() - start
+        timings["persist"] = persist_time
+        timings["slowest_call"] = max(call_latencies, default=0.0)
+        timings["total"] = time.perf_counter() - cycle_start
+
+        return {
+            "quests": results,
+            "timings": timings,
+            "crises": len(crises),
+            "generations": len(jobs),
+            "invalid": invalid,
+            "failed": failed,
+        }
@@ -0,0 +1,136 @@
+import json
+
+# --- THE STATIC INSTRUCTION BLOCK ---
+# Identical for every request, so it is built (and measured) once at import.
+# Only the economy fields below it change between calls.
+QUEST_INSTRUCTIONS = """You are the 'Grand Archivist' AI for a fantasy MMORPG.
+Generate a 'World Event Quest' to fix the economic problem described in each CRISIS block.
+
+MATH RULES:
+- If this is a GOLD SINK (Inflation), the objective must require players to collectively contribute roughly the Target Gold (approx 15% of supply).
+- DO NOT ask for more gold than exists in the Global Money Supply.
+- If this is a STIMULUS (Deflation), rewards should inject roughly the Target Gold.
+
+QUEST FORMAT (one raw JSON object per crisis):
+{
+    "title": "Quest Name",
+    "flavor_text": "Lore description.",
+    "objective": "Mission objective (mentioning the Target Gold).",
+    "reward": "Rewards.",
+    "type": "Gold Sink" or "Stimulus"
+}
+"""
+
+SINGLE_OUTPUT = "Return ONLY the raw JSON object for the crisis below.\n"
+BATCH_OUTPUT = "Return ONLY a raw JSON array with one quest object per crisis, in the same order as the crises below.\n"
+
+CRISIS_BLOCK = """
+CRISIS #{number}:
+- Global Money Supply: {money:,} Gold
+- Condition: {condition} (Severity: {severity}/10)
+- Inflation Rate: {inflation}%
+- Target Gold: {target:,}
+"""
+
+# Every quest must carry these fields before it is persisted
+REQUIRED_QUEST_FIELDS = ("title", "flavor_text", "objective", "reward", "type")
+
+# Rough Gemini ratio for English text. Only used when a response carries no
+# usage_metadata (failed calls, stub clients) and for sizing prompts up front
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    """ Approximates how many tokens a piece of text will cost. """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def is_valid_quest(quest):
+    """ True if the model returned a usable quest object. """
+    return isinstance(quest, dict) and all(quest.get(field) for field in REQUIRED_QUEST_FIELDS)
+
+
+def clean_response(text):
+    """ Strips the markdown fences Gemini likes to wrap JSON in. """
+    return text.replace("```json", "").replace("```", "").strip()
+
+
+class QuestPromptTemplate:
+    """
+    The Prompt Compiler.
+    Holds the precompiled instruction block and fills in only the variable
+    economy fields, for one crisis or a batch of crises in a single request.
+    """
+
+    def __init__(self, instructions=QUEST_INSTRUCTIONS, sink_ratio=0.15):
+        self.instructions = instructions
+        self.sink_ratio = sink_ratio  # Target 15% removal
+        self.single_prefix = instructions + SINGLE_OUTPUT
+        self.batch_prefix = instructions + BATCH_OUTPUT
+        self.instruction_tokens = estimate_tokens(self.single_prefix)
+
+    def crisis_block(self, economy_state, number=1):
+        """ Renders the variable part of the prompt for one economy state. """
+        # We calculate a "Sensible Target" so the AI doesn't hallucinate 100 Billion Gold
+        total_money = economy_state.get('money_supply', 1000000)  # Default to 1M if missing
+        return CRISIS_BLOCK.format(
+            number=number,
+            money=total_money,
+            condition=economy_state['condition'],
+            severity=economy_state['severity'],
+            inflation=economy_state['inflation'],
+            target=int(total_money * self.sink_ratio),
+        )
+
+    def render(self, economy_state):
+        """ Prompt for a single crisis. """
+        return self.single_prefix + self.crisis_block(economy_state)
+
+    def render_batch(self, economy_states):
+        """ Prompt for several crises; the instructions are sent only once. """
+        blocks = [self.crisis_block(state, number) for number, state in enumerate(economy_states, start=1)]
+        return self.batch_prefix + "".join(blocks)
+
+    @staticmethod
+    def parse(text):
+        """
+        Parses a single-quest response.
+        Raises ValueError if it is not a complete quest, so the cascade moves on.
+        """
+        quest = json.loads(clean_response(text))
+        if not is_valid_quest(quest):
+            raise ValueError("Reply is not a complete quest object")
+        return quest
+
+    @staticmethod
+    def split_batch(text, expected):
+        """
+        Splits a batched response into `expected` quests (in crisis order).
+        Accepts a JSON array or bare objects one after another; any quest the
+        model dropped, mangled or left incomplete comes back as None.
+        """
+        text = clean_response(text)
+
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            # Fall back to pulling out every top-level object we can decode
+            decoder = json.JSONDecoder()
+            data = []
+            index = text.find("{")
+            while index != -1:
+                try:
+                    obj, end = decoder.raw_decode(text, index)
+                except json.JSONDecodeError:
+                    index = text.find("{", index + 1)
+                    continue
+                data.append(obj)
+                index = text.find("{", end)
+
+        if isinstance(data, dict):
+            data = [data]
+        elif not isinstance(data, list):
+            data = []  # A scalar reply holds no quests
+
+        quests = [quest if is_valid_quest(quest) else None for quest in data[:expected]]
+        return quests + [None] * (expected - len(quests))
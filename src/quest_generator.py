@@ -1,20 +1,28 @@
 import os
 import json
 import time
+import uuid
 import certifi
 from google import genai
 from pymongo import MongoClient
 from dotenv import load_dotenv
 
+try:
+    from src.prompts import QuestPromptTemplate, estimate_tokens
+except ImportError:
+    from prompts import QuestPromptTemplate, estimate_tokens
+
 # 1. Load Secrets
 load_dotenv()
 api_key = os.getenv("GOOGLE_API_KEY")
 mongo_uri = os.getenv("MONGODB_URI")
 
+# Local quest archive (overridable, e.g. by the load-test harness)
+QUESTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'quests'))
+
 # 2. Configure Gemini AI
-if not api_key:
-    raise ValueError("❌ API Key not found!")
-client = genai.Client(api_key=api_key)
+# (No key is fine if a client is passed to QuestGenerator, e.g. the offline stub)
+client = genai.Client(api_key=api_key) if api_key else None
 
 # 3. Configure MongoDB (The Cloud Brain)
 if not mongo_uri:
@@ -39,41 +47,92 @@ class QuestGenerator:
     Implements 'Model Cascading' to ensure 100% uptime.
     """
 
+    def __init__(self, model_client=None, template=None):
+        self.client = model_client or client
+        if self.client is None:
+            raise ValueError("❌ API Key not found!")
+
+        self.template = template or QuestPromptTemplate()
+        self.token_log = []  # One entry per model request, successful or not
+
     def generate_quest(self, economy_state):
         print(f"🧠 AI Processing: Analyzing Economy State ({economy_state['condition']})...")
 
-        # --- CONTEXT INJECTION (The Math Fix) ---
-        # We calculate a "Sensible Target" so the AI doesn't hallucinate 100 Billion Gold
-        total_money = economy_state.get('money_supply', 1000000)  # Default to 1M if missing
-        target_sink = int(total_money * 0.15)  # Target 15% removal
+        prompt = self.build_prompt(economy_state)
+        quest_data = self.request_quest(prompt)
 
-        prompt = f"""
-        You are the 'Grand Archivist' AI for a fantasy MMORPG.
-        The game economy is currently in this state:
+        if quest_data is None:
+            quest_data = self.fallback_quest()
 
-        - Global Money Supply: {total_money:,} Gold
-        - Condition: {economy_state['condition']} (Severity: {economy_state['severity']}/10)
-        - Inflation Rate: {economy_state['inflation']}%
+        # --- SAVE IT IMMEDIATELY ---
+        self.save_quest(quest_data)
+        return quest_data
 
-        YOUR TASK:
-        Generate a 'World Event Quest' to fix this economic problem.
+    def build_prompt(self, economy_state):
+        """
+        Turns an economy state into the Grand Archivist prompt.
+        """
+        return self.template.render(economy_state)
 
-        MATH RULES:
-        - If this is a GOLD SINK (Inflation), the objective must require players to collectively contribute roughly {target_sink:,} Gold (approx 15% of supply).
-        - DO NOT ask for more gold than exists in the Global Money Supply.
-        - If this is a STIMULUS (Deflation), rewards should inject roughly {target_sink:,} Gold.
+    def request_quest(self, prompt):
+        """
+        Sends a prompt through the model cascade and parses the JSON reply.
+        Returns None if every model fails (the caller decides on a fallback).
+        """
+        return self._run_cascade(prompt, self.template.parse, quests=1)
 
-        OUTPUT FORMAT:
-        Return ONLY a raw JSON object with:
-        {{
-            "title": "Quest Name",
-            "flavor_text": "Lore description.",
-            "objective": "Mission objective (mentioning approx {target_sink:,} Gold).",
-            "reward": "Rewards.",
-            "type": "Gold Sink" or "Stimulus"
-        }}
+    def generate_quests_batch(self, economy_states):
         """
+        Generates quests for several crises in ONE request.
+        The instruction block is sent once; any quest missing from the reply
+        is replaced by the fallback quest.
+        """
+        print(f"🧠 AI Processing: Batch of {len(economy_states)} crises...")
+        expected = len(economy_states)
+
+        def parse(text):
+            quests = self.template.split_batch(text, expected)
+            if not any(quests):
+                # Nothing usable: let the cascade try the next model
+                raise ValueError("Batch reply contained no quests")
+            return quests
+
+        prompt = self.template.render_batch(economy_states)
+        quests = self._run_cascade(prompt, parse, quests=expected)
+        if quests is None:
+            quests = [None] * expected
+
+        results = []
+        for quest_data in quests:
+            if quest_data is None:
+                quest_data = self.fallback_quest()
+            self.save_quest(quest_data)
+            results.append(quest_data)
+        return results
 
+    def token_stats(self):
+        """
+        Summarises the token log: totals and average cost per quest.
+        Failed attempts still count towards the cost of the quests that succeeded.
+        """
+        prompt_tokens = sum(entry["prompt_tokens"] for entry in self.token_log)
+        response_tokens = sum(entry["response_tokens"] for entry in self.token_log)
+        quests = sum(entry["quests"] for entry in self.token_log if entry["success"])
+        return {
+            "requests": len(self.token_log),
+            "failed_requests": sum(not entry["success"] for entry in self.token_log),
+            "estimated_requests": sum(entry["token_source"] == "estimate" for entry in self.token_log),
+            "quests": quests,
+            "instruction_tokens": self.template.instruction_tokens,  # Static block, paid once per request
+            "prompt_tokens": prompt_tokens,
+            "response_tokens": response_tokens,
+            "tokens_per_quest": round((prompt_tokens + response_tokens) / quests, 1) if quests else 0.0,
+        }
+
+    def _run_cascade(self, prompt, parse, quests):
+        """
+        Tries each model in turn until one returns a reply that `parse` accepts.
+        """
         # --- MODEL CASCADE ARCHITECTURE ---
         # We try these models in order based on your "check_models.py" results
         models_to_try = [
@@ -83,23 +142,25 @@ class QuestGenerator:
         ]
 
         for model_name in models_to_try:
+            start = time.perf_counter()
+            response = None
             try:
                 print(f"🤖 Attempting generation with model: {model_name}...")
 
-                response = client.models.generate_content(
+                response = self.client.models.generate_content(
                     model=model_name,
                     contents=prompt
                 )
 
                 # If we get here, it worked! Clean and return.
-                clean_json = response.text.replace("```json", "").replace("```", "").strip()
-                quest_data = json.loads(clean_json)
-
-                # --- SUCCESS: SAVE IT IMMEDIATELY ---
-                self.save_quest(quest_data)
-                return quest_data
+                result = parse(response.text)
+                self._log_request(model_name, prompt, response, quests, start, success=True)
+                return result
 
             except Exception as e:
+                # The prompt (and any reply) is billed even when the attempt fails
+                self._log_request(model_name, prompt, response, quests, start, success=False)
+
                 # If error is 503 (Server Overload) or 429 (Rate Limit), continue to next model
                 if "503" in str(e) or "429" in str(e):
                     print(f"⚠️ {model_name} is busy/rate-limited. Falling back...")
@@ -113,7 +174,40 @@ class QuestGenerator:
                     print(f"❌ Error with {model_name}: {e}")
                     continue
 
-        # --- FALLBACK PROTOCOL (If ALL models fail) ---
+        return None
+
+    def _log_request(self, model_name, prompt, response, quests, start, success):
+        """
+        Records one attempt. Uses Gemini's own usage_metadata counts when the
+        response carries them, and the chars/4 estimate otherwise (no reply,
+        or a stub client).
+        """
+        usage = getattr(response, "usage_metadata", None)
+        prompt_count = getattr(usage, "prompt_token_count", None)
+        response_count = getattr(usage, "candidates_token_count", None)
+
+        if prompt_count is not None:
+            source = "usage_metadata"
+            prompt_tokens, response_tokens = prompt_count, response_count or 0
+        else:
+            source = "estimate"
+            prompt_tokens = estimate_tokens(prompt)
+            response_tokens = estimate_tokens(getattr(response, "text", None) or "")
+
+        self.token_log.append({
+            "model": model_name,
+            "quests": quests,
+            "success": success,
+            "token_source": source,
+            "prompt_tokens": prompt_tokens,
+            "response_tokens": response_tokens,
+            "latency": round(time.perf_counter() - start, 3),
+        })
+
+    def fallback_quest(self):
+        """
+        FALLBACK PROTOCOL (If ALL models fail).
+        """
         print("❌ ALL AI MODELS OFFLINE. Engaging Emergency Protocol.")
         timestamp = time.strftime("%H:%M:%S")
 
@@ -125,8 +219,6 @@ class QuestGenerator:
             "type": "Fallback Mechanism",
             "generated_at": time.strftime("%Y%m%d-%H%M%S")
         }
-
-        self.save_quest(fallback_quest)
         return fallback_quest
 
     def save_quest(self, quest_data):
@@ -140,13 +232,14 @@ class QuestGenerator:
             quest_data["generated_at"] = timestamp
 
         # --- 1. Save to Local File ---
-        base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'quests'))
+        base_path = QUESTS_DIR
         if not os.path.exists(base_path):
             os.makedirs(base_path)
 
         # Sanitize filename
         safe_title = "".join([c if c.isalnum() else "_" for c in quest_data['title']])
-        filename = f"{safe_title}_{timestamp}.json"
+        # Unique suffix: concurrent saves of the same title in the same second must not overwrite
+        filename = f"{safe_title}_{timestamp}_{uuid.uuid4().hex[:8]}.json"
         full_path = os.path.join(base_path, filename)
 
         with open(full_path, "w") as f:
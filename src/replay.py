@@ -0,0 +1,187 @@
+import copy
+import json
+
+try:
+    from src.economy import diagnose_state
+except ImportError:
+    from economy import diagnose_state
+
+
+class SimulationRecorder:
+    """
+    The Flight Recorder.
+    Steps an Economy + CentralBankAI pair forward one 'month' at a time,
+    snapshots their full state (including the Economy RNG) every N steps,
+    and logs every policy decision and generated quest.
+
+    A recorded run can then be replayed: seek() restores the nearest
+    checkpoint and re-executes from there, feeding back the recorded quests
+    instead of calling the Quest AI again.
+    """
+
+    def __init__(self, economy, central_bank, quest_generator=None,
+                 checkpoint_interval=30, faucet=0):
+        self.economy = economy
+        self.central_bank = central_bank
+        self.quest_generator = quest_generator
+        self.checkpoint_interval = checkpoint_interval
+        self.faucet = faucet  # Gold injected every step (monster kills)
+
+        self.step_count = 0
+        self.end_step = 0      # Last step of the recording
+        self.checkpoints = {}  # step -> snapshot
+        self.policy_log = {}   # step -> tax rate chosen by the Central Bank
+        self.quest_log = {}    # step -> quest returned by the Quest AI
+
+        # Step 0 is always restorable
+        self.checkpoint()
+
+    # --- STATE CAPTURE ---
+
+    def snapshot(self):
+        """ Captures Economy, CentralBankAI and RNG state as plain data. """
+        economy_state = {k: v for k, v in vars(self.economy).items() if k != "rng"}
+        return {
+            "step": self.step_count,
+            "economy": copy.deepcopy(economy_state),
+            "central_bank": copy.deepcopy(vars(self.central_bank)),
+            "rng_state": self.economy.rng.getstate(),
+        }
+
+    def checkpoint(self):
+        """ Stores a snapshot of the current step. """
+        self.checkpoints[self.step_count] = self.snapshot()
+
+    def restore(self, snapshot):
+        """ Puts the live objects back into the state held by a snapshot. """
+        vars(self.economy).update(copy.deepcopy(snapshot["economy"]))
+        vars(self.central_bank).update(copy.deepcopy(snapshot["central_bank"]))
+        self.economy.rng.setstate(snapshot["rng_state"])
+        self.step_count = snapshot["step"]
+
+    def current_stats(self, quest=None):
+        """ Stats dict for the step the live objects are currently at. """
+        condition, _, _ = diagnose_state(self.economy.inflation_rate)
+        return {
+            "step": self.step_count,
+            "condition": condition,
+            "quest": quest,
+            "money_supply": self.economy.money_supply,
+            "inflation_rate": self.economy.inflation_rate,
+            "tax_rate": self.economy.tax_rate,
+        }
+
+    # --- SIMULATION ---
+
+    def step(self, replay=False):
+        """
+        Moves the simulation forward by one 'month'.
+        In replay mode, quests come from the log and policy decisions are
+        checked against the recording so any divergence is caught early.
+        """
+        self.step_count += 1
+        day = self.step_count
+
+        if self.faucet:
+            self.economy.inject_money(self.faucet)
+
+        stats = self.economy.update_economy()
+        tax_rate = self.central_bank.decide_policy(self.economy)
+
+        if replay:
+            recorded = self.policy_log.get(day)
+            if recorded is not None and recorded != tax_rate:
+                raise RuntimeError(
+                    f"Replay diverged at step {day}: recorded tax {recorded}, got {tax_rate}"
+                )
+        else:
+            self.policy_log[day] = tax_rate
+
+        quest = None
+        condition, severity, sentiment = diagnose_state(stats["inflation_rate"])
+        if replay:
+            quest = self.quest_log.get(day)
+        elif condition != "Stable" and self.quest_generator is not None:
+            economy_state = {
+                "condition": condition,
+                "severity": severity,
+                "inflation": stats["inflation_rate"],
+                "sentiment": sentiment,
+                "money_supply": stats["money_supply"],
+            }
+            quest = self.quest_generator.generate_quest(economy_state)
+            self.quest_log[day] = quest
+
+        if not replay:
+            self.end_step = day
+            if self.checkpoint_interval and day % self.checkpoint_interval == 0:
+                self.checkpoint()
+
+        return self.current_stats(quest)
+
+    def run(self, steps):
+        """
+        Records `steps` new months of simulation from the current step.
+        Recording after a seek() starts a new branch: anything recorded past
+        the current step is discarded.
+        """
+        if self.step_count < self.end_step:
+            self.checkpoints = {s: c for s, c in self.checkpoints.items() if s <= self.step_count}
+            self.policy_log = {s: t for s, t in self.policy_log.items() if s <= self.step_count}
+            self.quest_log = {s: q for s, q in self.quest_log.items() if s <= self.step_count}
+            self.end_step = self.step_count
+
+        return [self.step() for _ in range(steps)]
+
+    def seek(self, target_step):
+        """
+        Jumps to `target_step` of a recorded run.
+        Restores the nearest checkpoint at or before it and replays the rest.
+        """
+        if not 0 <= target_step <= self.end_step:
+            raise ValueError(f"target_step must be between 0 and {self.end_step} (the recorded end)")
+
+        nearest = max(s for s in self.checkpoints if s <= target_step)
+        self.restore(self.checkpoints[nearest])
+
+        while self.step_count < target_step:
+            self.step(replay=True)
+        return self.current_stats(self.quest_log.get(self.step_count))
+
+    # --- PERSISTENCE ---
+
+    def save(self, path):
+        """ Writes checkpoints and logs to a JSON file. """
+        record = {
+            "checkpoint_interval": self.checkpoint_interval,
+            "faucet": self.faucet,
+            "end_step": self.end_step,
+            "checkpoints": list(self.checkpoints.values()),
+            "policy_log": self.policy_log,
+            "quest_log": self.quest_log,
+        }
+        with open(path, "w") as f:
+            json.dump(record, f, indent=4)
+
+    def load(self, path):
+        """
+        Reads a recording written by save() and replays it to its recorded end.
+        Call seek() afterwards to jump to any step of the run.
+        """
+        with open(path) as f:
+            record = json.load(f)
+
+        self.checkpoint_interval = record["checkpoint_interval"]
+        self.faucet = record["faucet"]
+        self.policy_log = {int(k): v for k, v in record["policy_log"].items()}
+        self.quest_log = {int(k): v for k, v in record["quest_log"].items()}
+
+        self.checkpoints = {}
+        for snapshot in record["checkpoints"]:
+            # JSON turns the RNG state tuple into nested lists
+            version, internal, gauss_next = snapshot["rng_state"]
+            snapshot["rng_state"] = (version, tuple(internal), gauss_next)
+            self.checkpoints[snapshot["step"]] = snapshot
+
+        self.end_step = record["end_step"]
+        return self.seek(self.end_step)
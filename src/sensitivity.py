@@ -0,0 +1,298 @@
+import argparse
+import itertools
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from src.economy import Economy
+    from src.central_bank import CentralBankAI, STRATEGY_PROFILES
+except ImportError:
+    from economy import Economy
+    from central_bank import CentralBankAI, STRATEGY_PROFILES
+
+# The same daily loop as the Streamlit dashboard (app.py), with its defaults
+BASE_SCENARIO = {
+    "strategy": "Balanced",
+    "days": 365,
+    "start_money": 100_000_000,
+    "start_tax": 0.05,
+    "daily_print": 10_000,        # Faucet: monster kills per day
+    "trade_fraction": 0.20,       # Share of the money supply traded (and taxed) daily
+    "gold_rush_start": 100,
+    "gold_rush_days": 60,
+    "gold_rush_intensity": 1.0,   # x Normal Income (1.0 = no gold rush)
+    "whale_day": -1,              # -1 = no whale deposit
+    "whale_amount": 0,
+}
+
+# Central Bank thresholds that can be swept alongside the scenario fields
+POLICY_PARAMETERS = set(STRATEGY_PROFILES["Balanced"])
+
+# Largest grid a single query may ask for (the API is public)
+MAX_GRID_POINTS = 20_000
+
+# Memoized results: frozen scenario -> metrics (shared by API threads)
+_cache = {}
+_cache_lock = threading.Lock()
+CACHE_LIMIT = 200_000
+
+# Below this many uncached points, process start-up costs more than it saves
+PARALLEL_THRESHOLD = 500
+
+# One process pool for the whole process, created on first use
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def simulate(scenario):
+    """
+    Runs one scenario through the dashboard's daily loop and returns its metrics.
+
+    This is the hot loop of every sweep, so Economy.inject_money/transaction and
+    CentralBankAI.decide_policy are inlined on local variables. The arithmetic is
+    the same, step for step, as driving the objects themselves.
+    """
+    policy = {k: v for k, v in scenario.items() if k in POLICY_PARAMETERS}
+    world = Economy(start_money=scenario["start_money"], start_tax=scenario["start_tax"])
+    p = CentralBankAI(scenario["strategy"], **policy).params
+
+    target = world.inflation_target
+    upper, lower = target * p["upper_band"], target * p["lower_band"]
+    raise_step, cut_step = p["raise_step"], p["cut_step"]
+    tax_cap, tax_floor = p["tax_cap"], p["tax_floor"]
+
+    rush_start = scenario["gold_rush_start"]
+    rush_end = rush_start + scenario["gold_rush_days"]
+    daily_print = scenario["daily_print"]
+    rush_print = daily_print * scenario["gold_rush_intensity"]
+    trade_fraction = scenario["trade_fraction"]
+    whale_day, whale_amount = scenario["whale_day"], scenario["whale_amount"]
+
+    money = world.money_supply
+    tax = world.tax_rate
+    peak_money = money
+    max_tax = tax
+
+    for day in range(scenario["days"]):
+        # A. DAILY INCOME (The Faucet)
+        money += rush_print if rush_start <= day <= rush_end else daily_print
+        if day == whale_day:
+            money += whale_amount
+
+        # B. PLAYER TRADING (the tax burns part of the traded volume)
+        money -= money * trade_fraction * tax
+
+        # C. AI DECISION
+        if money > upper:
+            tax = min(tax_cap, tax + raise_step)
+        elif money < lower:
+            tax = max(tax_floor, tax - cut_step)
+
+        if money > peak_money:
+            peak_money = money
+        if tax > max_tax:
+            max_tax = tax
+
+    return {
+        "peak_inflation": round((peak_money / target - 1.0) * 100, 2),
+        "final_inflation": round((money / target - 1.0) * 100, 2),
+        "final_tax": round(tax, 4),
+        "max_tax": round(max_tax, 4),
+    }
+
+
+def _simulate_key(key):
+    """ Process-pool worker: scenarios travel as sorted item tuples. """
+    return simulate(dict(key))
+
+
+def _get_pool(workers):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers)
+        return _pool
+
+
+def range_steps(name, spec):
+    """
+    Number of steps in a {"start", "stop", "steps"} spec (default 2), checked
+    before anything is expanded. Raises ValueError for malformed specs.
+    """
+    missing = {"start", "stop"} - set(spec)
+    if missing:
+        raise ValueError(f"Range for {name} needs {' and '.join(sorted(missing))}")
+    for field in ("start", "stop"):
+        if isinstance(spec[field], bool) or not isinstance(spec[field], (int, float)):
+            raise ValueError(f"Range for {name}: {field} must be a number, got {spec[field]!r}")
+    steps = spec.get("steps", 2)
+    if isinstance(steps, bool) or not isinstance(steps, (int, float)) or steps != int(steps):
+        raise ValueError(f"Range for {name}: steps must be a whole number, got {steps!r}")
+    return int(steps)
+
+
+def expand_range(spec):
+    """
+    Turns a parameter range into a list of values.
+    Accepts a list of values or {"start": a, "stop": b, "steps": n} (inclusive).
+    """
+    if isinstance(spec, dict):
+        start, stop, steps = spec["start"], spec["stop"], int(spec.get("steps", 2))
+        if steps < 2:
+            return [start]
+        step = (stop - start) / (steps - 1)
+        return [round(start + i * step, 10) for i in range(steps)]
+    if isinstance(spec, (list, tuple)):
+        return list(spec)
+    return [spec]
+
+
+def evaluate_grid(ranges, base=None, inflation_limit=10.0, workers=None, max_points=MAX_GRID_POINTS):
+    """
+    The What-If Engine.
+    Evaluates every combination of `ranges` on top of `base` (BASE_SCENARIO
+    overrides) and returns the response surface plus the stability region:
+    the points whose peak inflation stays under `inflation_limit` (%).
+
+    Results are memoized across calls. With workers > 1, large uncached grids
+    are spread over a shared process pool; workers=1 keeps it in this process.
+    """
+    start = time.perf_counter()
+    known_names = set(BASE_SCENARIO) | POLICY_PARAMETERS
+
+    for label, params in (("parameter", ranges), ("base parameter", base or {})):
+        unknown = set(params) - known_names
+        if unknown:
+            raise ValueError(f"Unknown {label}(s): {', '.join(sorted(unknown))}")
+
+    scenario = {**BASE_SCENARIO, **(base or {})}
+    names = list(ranges)
+
+    # Check the size before building a single key
+    steps = [range_steps(name, spec) for name, spec in ranges.items() if isinstance(spec, dict)]
+    if any(n > max_points for n in steps):
+        raise ValueError(f"Grid too large: more than {max_points} points")
+    axes = {name: expand_range(ranges[name]) for name in names}
+    for name, values in axes.items():
+        bad = [value for value in values if isinstance(value, (dict, list))]
+        if bad:
+            raise ValueError(f"Range for {name}: values must be numbers or strings, got {bad[0]!r}")
+    total = math.prod(len(values) for values in axes.values())
+    if total > max_points:
+        raise ValueError(f"Grid too large: {total} points (max {max_points})")
+
+    keys = [
+        tuple(sorted({**scenario, **dict(zip(names, values))}.items()))
+        for values in itertools.product(*axes.values())
+    ]
+
+    # --- MEMOIZATION: only simulate what we have not seen before ---
+    with _cache_lock:
+        known = {key: _cache[key] for key in keys if key in _cache}
+    missing = list(dict.fromkeys(key for key in keys if key not in known))
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(missing) >= PARALLEL_THRESHOLD:
+        results = _get_pool(workers).map(_simulate_key, missing, chunksize=max(1, len(missing) // (workers * 4)))
+        fresh = dict(zip(missing, results))
+    else:
+        fresh = {key: _simulate_key(key) for key in missing}
+
+    with _cache_lock:
+        if len(_cache) + len(fresh) > CACHE_LIMIT:
+            _cache.clear()
+        _cache.update(fresh)
+    known.update(fresh)
+
+    # --- RESPONSE SURFACE + STABILITY REGION ---
+    # For each axis: the values that stay stable whatever the other swept
+    # parameters are set to, built in the same pass as the points.
+    # Anything finer can be read off `stable_mask`.
+    stable_by_axis = {name: dict.fromkeys(values, True) for name, values in axes.items()}
+    points = []
+    for values, key in zip(itertools.product(*axes.values()), keys):
+        metrics = known[key]
+        stable = metrics["peak_inflation"] <= inflation_limit
+        if not stable:
+            for name, value in zip(names, values):
+                stable_by_axis[name][value] = False
+        points.append({
+            **dict(zip(names, values)),
+            **metrics,
+            "stable": stable,
+        })
+
+    always_stable = {
+        name: [value for value in values if stable_by_axis[name][value]]
+        for name, values in axes.items()
+    }
+
+    return {
+        "parameters": names,
+        "axes": axes,
+        # Metric values in row-major order of `axes`, ready to reshape into a grid
+        "surface": {metric: [point[metric] for point in points]
+                    for metric in ("peak_inflation", "final_inflation", "final_tax", "max_tax")},
+        "stable_mask": [point["stable"] for point in points],
+        "points": points,
+        "stable_points": sum(point["stable"] for point in points),
+        "always_stable": always_stable,
+        "evaluated": len(fresh),
+        "cached": len(keys) - len(fresh),
+        "elapsed": round(time.perf_counter() - start, 3),
+    }
+
+
+def _parse_value(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def parse_range(text):
+    """ 'name=start:stop:steps' or 'name=a,b,c' -> (name, range spec) """
+    name, _, spec = text.partition("=")
+    if spec.count(":") == 2:
+        start, stop, steps = spec.split(":")
+        return name, {"start": float(start), "stop": float(stop), "steps": int(steps)}
+    return name, [_parse_value(value) for value in spec.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep Central Bank and Economy parameters and report stability.")
+    parser.add_argument("--param", action="append", type=parse_range, required=True,
+                        help="name=start:stop:steps or name=a,b,c (repeatable), e.g. tax_cap=0.1:0.9:9")
+    parser.add_argument("--base", action="append", type=parse_range, default=[],
+                        help="name=value override of the base scenario, e.g. gold_rush_intensity=5")
+    parser.add_argument("--inflation-limit", type=float, default=10.0, help="Max peak inflation (%%) counted as stable")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-points", type=int, default=MAX_GRID_POINTS, help="Refuse grids larger than this")
+    parser.add_argument("--json", action="store_true", help="Print the full result as JSON")
+    args = parser.parse_args()
+
+    base = {name: spec[0] if isinstance(spec, list) else spec for name, spec in args.base}
+    try:
+        result = evaluate_grid(dict(args.param), base, args.inflation_limit, args.workers, args.max_points)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.json:
+        print(json.dumps(result, indent=4))
+        return
+
+    total = len(result["points"])
+    print(f"\n🧪 SENSITIVITY ANALYSIS: {total} points in {result['elapsed']}s")
+    print(f"   - Stable (peak inflation <= {args.inflation_limit}%): {result['stable_points']}/{total}")
+    for name, values in result["always_stable"].items():
+        if values:
+            print(f"   - {name}: stable for every other setting at {', '.join(map(str, values))}")
+        else:
+            print(f"   - {name}: no value is stable for every other setting")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import copy
+import itertools
+import json
+import random
+import re
+import threading
+import time
+
+
+class StubResponse:
+    """ Mimics the `.text` attribute of a Gemini response. """
+
+    def __init__(self, text):
+        self.text = text
+
+
+class StubModels:
+    """ Mimics `client.models`; delegates to the owning client. """
+
+    def __init__(self, owner):
+        self.owner = owner
+
+    def generate_content(self, model, contents):
+        return self.owner.generate(model, contents)
+
+
+class StubModelClient:
+    """
+    The Offline Oracle.
+    Drop-in replacement for `genai.Client` that answers instantly with
+    well-formed quests, so QuestGenerator can run without network or API key:
+
+        QuestGenerator(model_client=StubModelClient())
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.models = StubModels(self)
+
+    def generate(self, model, contents):
+        self.calls.append({"model": model, "contents": contents})
+
+        # One quest per CRISIS block; batched prompts get a JSON array back
+        crises = re.findall(r"CRISIS #(\d+):\s*\n- Global Money Supply: [\d,]+ Gold\s*\n- Condition: ([^(\n]+)", contents)
+        quests = [self.make_quest(int(number), condition.strip()) for number, condition in crises]
+
+        if "JSON array" in contents:
+            return StubResponse("```json\n" + json.dumps(quests) + "\n```")
+        return StubResponse(json.dumps(quests[0] if quests else self.make_quest(1, "Unknown")))
+
+    @staticmethod
+    def make_quest(number, condition):
+        is_sink = "Inflation" in condition
+        return {
+            "title": f"Stub Quest #{number}: {condition}",
+            "flavor_text": "The Grand Archivist answers from an offline scroll.",
+            "objective": "Contribute the Target Gold to the Void Bank.",
+            "reward": "Stub Stability Token",
+            "type": "Gold Sink" if is_sink else "Stimulus",
+        }
+
+
+class FakeGeminiClient(StubModelClient):
+    """
+    The Unreliable Oracle.
+    StubModelClient with configurable latency and error rate, for load tests.
+    Errors look like Gemini's 503/429 so the model cascade treats them the
+    same way it treats the real thing.
+    """
+
+    def __init__(self, latency=0.2, jitter=0.0, error_rate=0.0, seed=None):
+        super().__init__()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def generate(self, model, contents):
+        with self.lock:
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+            failed = self.rng.random() < self.error_rate
+
+        time.sleep(delay)
+        if failed:
+            raise Exception(f"503 UNAVAILABLE: {model} is overloaded (simulated)")
+        return super().generate(model, contents)
+
+
+class InsertResult:
+    """ Mimics pymongo's InsertOneResult. """
+
+    def __init__(self, inserted_id):
+        self.inserted_id = inserted_id
+
+
+class InMemoryCollection:
+    """
+    The Pocket Atlas.
+    Minimal stand-in for a pymongo Collection (insert_one / find_one / find)
+    with an optional per-operation latency and a bounded connection pool, so
+    load tests can surface pool exhaustion without a live MongoDB.
+    """
+
+    def __init__(self, latency=0.0, pool_size=100, wait_timeout=1.0):
+        self.latency = latency
+        self.wait_timeout = wait_timeout
+        self.pool = threading.BoundedSemaphore(pool_size)
+        self.docs = []
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def _checkout(self):
+        if not self.pool.acquire(timeout=self.wait_timeout):
+            raise RuntimeError("Timed out waiting for a connection from the pool (simulated)")
+        if self.latency:
+            time.sleep(self.latency)
+
+    def insert_one(self, document):
+        self._checkout()
+        try:
+            with self.lock:
+                document.setdefault("_id", next(self.ids))
+                self.docs.append(copy.deepcopy(document))
+            return InsertResult(document["_id"])
+        finally:
+            self.pool.release()
+
+    def find(self, filter=None, sort=None):
+        self._checkout()
+        try:
+            with self.lock:
+                docs = [copy.deepcopy(d) for d in self.docs
+                        if all(d.get(k) == v for k, v in (filter or {}).items())]
+        finally:
+            self.pool.release()
+
+        for key, direction in reversed(sort or []):
+            docs.sort(key=lambda d: d.get(key), reverse=direction < 0)
+        return docs
+
+    def find_one(self, filter=None, sort=None):
+        docs = self.find(filter, sort)
+        return docs[0] if docs else None
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Make `src` importable no matter where pytest is launched from
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+api = pytest.importorskip("src.api")
+
+from src import quest_generator
+from src.loadtest import run_load_test
+from src.stubs import InMemoryCollection
+
+REPORT_KEYS = {"requests", "errors", "p50_ms", "p95_ms", "p99_ms", "mean_ms", "throughput_rps", "max_loop_lag_ms"}
+
+
+@pytest.fixture(autouse=True)
+def restore_connections(monkeypatch):
+    """ install_stand_ins() swaps module globals; put the originals back afterwards. """
+    monkeypatch.setattr(api, "collection", api.collection)
+    monkeypatch.setattr(quest_generator, "db_collection", quest_generator.db_collection)
+    monkeypatch.setattr(quest_generator, "client", quest_generator.client)
+    monkeypatch.setattr(quest_generator, "QUESTS_DIR", quest_generator.QUESTS_DIR)
+
+
+def test_report_has_every_endpoint_and_stat():
+    endpoints = [
+        ("GET", "/current-quest", None),
+        ("POST", "/run-simulation", None),
+        ("POST", "/sensitivity", {"ranges": {"tax_cap": [0.3, 0.5]}}),
+    ]
+    report = run_load_test(endpoints, requests=6, concurrency=3, gemini_latency=0.0, seed=1)
+
+    assert list(report) == ["GET /current-quest", "POST /run-simulation", "POST /sensitivity"]
+    for stats in report.values():
+        assert set(stats) == REPORT_KEYS
+        assert stats["requests"] == 6
+        assert stats["errors"] == 0
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+
+
+def test_gemini_outage_counts_as_errors():
+    # Every model answers 503, so each simulation ends on the fallback quest
+    report = run_load_test([("POST", "/run-simulation", None)], requests=2, concurrency=2,
+                           gemini_latency=0.0, gemini_error_rate=1.0, seed=1)
+
+    assert report["POST /run-simulation"]["errors"] == 2
+
+
+def test_exhausted_pool_times_out():
+    # One connection held for 200 ms; three of four concurrent readers give up after 50 ms
+    report = run_load_test([("GET", "/current-quest", None)], requests=4, concurrency=4,
+                           db_latency=0.2, pool_size=1, pool_wait_timeout=0.05)
+
+    assert report["GET /current-quest"]["errors"] >= 1
+
+
+def test_in_memory_collection_pool_wait_timeout():
+    collection = InMemoryCollection(latency=0.2, pool_size=1, wait_timeout=0.05)
+    errors = []
+
+    def read():
+        try:
+            collection.find_one()
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 2
+    assert "Timed out waiting for a connection" in str(errors[0])
@@ -0,0 +1,106 @@
+import json
+import time
+
+import pytest
+
+from src.pipeline import QuestPipeline
+from src.stubs import FakeGeminiClient, StubModelClient, StubResponse
+
+quest_generator = pytest.importorskip("src.quest_generator")
+
+
+@pytest.fixture(autouse=True)
+def offline_archive(tmp_path, monkeypatch):
+    """ Quests go to a temp dir and never to MongoDB. """
+    monkeypatch.setattr(quest_generator, "QUESTS_DIR", str(tmp_path))
+    monkeypatch.setattr(quest_generator, "db_collection", None)
+    return tmp_path
+
+
+def stats(inflation, region=None):
+    state = {"inflation_rate": inflation, "money_supply": 100_000_000, "tax_rate": 0.05}
+    if region:
+        state["region"] = region
+    return state
+
+
+class OfflineClient(StubModelClient):
+    """ Every model errors without a 503/429, so the cascade fails fast. """
+
+    def generate(self, model, contents):
+        raise Exception("500 INTERNAL (simulated)")
+
+
+class UntitledClient(StubModelClient):
+    """ Answers with JSON that is not a quest. """
+
+    def generate(self, model, contents):
+        return StubResponse(json.dumps({"quest": "no title"}))
+
+
+def test_collect_drops_stable_states():
+    pipeline = QuestPipeline(quest_generator.QuestGenerator(model_client=StubModelClient()))
+    crises = pipeline.collect([stats(12.0, "North"), stats(1.0), stats(-5.0)])
+    assert [c["region"] for c in crises] == ["North", "Region 3"]
+    assert [c["condition"] for c in crises] == ["Hyper-Inflation", "Deflationary Spiral"]
+
+
+def test_deduplicate_buckets_by_inflation():
+    pipeline = QuestPipeline(quest_generator.QuestGenerator(model_client=StubModelClient()), inflation_bucket=5.0)
+    crises = pipeline.collect([stats(11, "A"), stats(14, "B"), stats(16, "C"),
+                               stats(-3, "D"), stats(-4, "E"), stats(-6, "F")])
+    groups = [regions for _, regions in pipeline.deduplicate(crises)]
+    assert groups == [["A", "B"], ["C"], ["D", "E"], ["F"]]
+
+
+def test_outages_are_failed_and_replaced_by_fallback(offline_archive):
+    generator = quest_generator.QuestGenerator(model_client=OfflineClient())
+    report = QuestPipeline(generator, inflation_bucket=1).run([stats(10 + i * 2) for i in range(3)])
+
+    assert report["failed"] == 3
+    assert report["invalid"] == 0
+    assert all(item["quest"]["type"] == "Fallback Mechanism" for item in report["quests"])
+    assert len(list(offline_archive.iterdir())) == 3
+
+
+def test_untitled_replies_fall_through_the_cascade():
+    generator = quest_generator.QuestGenerator(model_client=UntitledClient())
+    quest = generator.generate_quest({"condition": "Hyper-Inflation", "severity": 8, "inflation": 12})
+    assert quest["type"] == "Fallback Mechanism"
+    assert sum(not entry["success"] for entry in generator.token_log) == 3
+
+
+def test_invalid_quests_are_counted_and_replaced():
+    class SloppyGenerator(quest_generator.QuestGenerator):
+        def request_quest(self, prompt):
+            return {"title": "Half a quest"}
+
+    report = QuestPipeline(SloppyGenerator(model_client=StubModelClient())).run([stats(12)])
+    assert report["invalid"] == 1
+    assert report["failed"] == 0
+    assert report["quests"][0]["quest"]["type"] == "Fallback Mechanism"
+
+
+def test_cycle_takes_about_one_call():
+    latency, calls = 0.2, 6
+    generator = quest_generator.QuestGenerator(model_client=FakeGeminiClient(latency=latency))
+    pipeline = QuestPipeline(generator, max_workers=calls, inflation_bucket=1)
+
+    start = time.perf_counter()
+    report = pipeline.run([stats(10 + i * 2) for i in range(calls)])
+    elapsed = time.perf_counter() - start
+
+    assert report["generations"] == calls
+    assert latency <= elapsed < latency * 2
+    assert report["timings"]["slowest_call"] >= latency
+
+
+def test_run_multi_crisis_cycle(monkeypatch):
+    monkeypatch.setattr(quest_generator, "client", StubModelClient())
+    from src.main import run_multi_crisis_cycle
+
+    report = run_multi_crisis_cycle(regions=4, max_workers=4)
+    # Every region starts at 150M gold, so every region is in crisis
+    assert report["crises"] == 4
+    assert sum(len(item["regions"]) for item in report["quests"]) == 4
+    assert report["failed"] == report["invalid"] == 0
@@ -0,0 +1,133 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.prompts import QuestPromptTemplate, estimate_tokens
+from src.stubs import StubModelClient, StubResponse
+
+STATE = {"condition": "Hyper-Inflation", "severity": 8, "inflation": 12.3, "money_supply": 150_000_000}
+QUEST_A = StubModelClient.make_quest(1, "Hyper-Inflation")
+QUEST_B = StubModelClient.make_quest(2, "Deflationary Spiral")
+
+
+def test_render_fills_only_the_variable_block():
+    template = QuestPromptTemplate()
+    prompt = template.render(STATE)
+    assert prompt.startswith(template.single_prefix)
+    assert "150,000,000 Gold" in prompt
+    assert "Target Gold: 22,500,000" in prompt
+
+
+def test_batch_sends_instructions_once():
+    template = QuestPromptTemplate()
+    prompt = template.render_batch([STATE] * 4)
+    assert prompt.count(template.instructions) == 1
+    assert prompt.count("CRISIS #") == 4
+    assert estimate_tokens(prompt) < 4 * estimate_tokens(template.render(STATE))
+
+
+def test_split_batch_array():
+    text = "```json\n" + json.dumps([QUEST_A, QUEST_B]) + "\n```"
+    assert QuestPromptTemplate.split_batch(text, 2) == [QUEST_A, QUEST_B]
+
+
+def test_split_batch_concatenated_objects():
+    text = json.dumps(QUEST_A) + "\n\n" + json.dumps(QUEST_B)
+    assert QuestPromptTemplate.split_batch(text, 2) == [QUEST_A, QUEST_B]
+
+
+def test_split_batch_short_reply_is_padded():
+    assert QuestPromptTemplate.split_batch(json.dumps([QUEST_A]), 3) == [QUEST_A, None, None]
+
+
+def test_split_batch_mangled_reply():
+    text = json.dumps(QUEST_A) + ' {"title": "broken", ' + json.dumps(QUEST_B)
+    assert QuestPromptTemplate.split_batch(text, 2) == [QUEST_A, QUEST_B]
+    assert QuestPromptTemplate.split_batch("the archivist is silent", 2) == [None, None]
+    assert QuestPromptTemplate.split_batch(json.dumps([QUEST_A, 3]), 2) == [QUEST_A, None]
+
+
+def test_split_batch_incomplete_and_scalar_replies():
+    partial = {"title": "Half a quest", "type": "Gold Sink"}
+    assert QuestPromptTemplate.split_batch(json.dumps([QUEST_A, {"name": "x"}, partial]), 3) == [QUEST_A, None, None]
+    assert QuestPromptTemplate.split_batch("42", 2) == [None, None]
+    assert QuestPromptTemplate.split_batch('"a string"', 1) == [None]
+
+
+def test_parse_rejects_incomplete_quest():
+    with pytest.raises(ValueError):
+        QuestPromptTemplate.parse(json.dumps({"quest": "no title"}))
+    assert QuestPromptTemplate.parse(json.dumps(QUEST_A)) == QUEST_A
+
+
+class GarbleFirstClient(StubModelClient):
+    """ First reply is not JSON, later replies are fine. """
+
+    def generate(self, model, contents):
+        if not self.calls:
+            self.calls.append({"model": model, "contents": contents})
+            return StubResponse("not json")
+        return super().generate(model, contents)
+
+
+def test_token_log_counts_failed_attempts(tmp_path, monkeypatch):
+    quest_generator = pytest.importorskip("src.quest_generator")
+    monkeypatch.setattr(quest_generator, "QUESTS_DIR", str(tmp_path))
+    monkeypatch.setattr(quest_generator, "db_collection", None)
+
+    generator = quest_generator.QuestGenerator(model_client=GarbleFirstClient())
+    quests = generator.generate_quests_batch([STATE, dict(STATE, condition="Deflationary Spiral")])
+
+    assert [q["type"] for q in quests] == ["Gold Sink", "Stimulus"]
+    assert len(list(tmp_path.iterdir())) == 2
+
+    stats = generator.token_stats()
+    assert stats["requests"] == 2
+    assert stats["failed_requests"] == 1
+    assert stats["quests"] == 2
+    assert stats["instruction_tokens"] == generator.template.instruction_tokens
+    assert stats["tokens_per_quest"] == (stats["prompt_tokens"] + stats["response_tokens"]) / 2
+
+
+class PartialBatchClient(StubModelClient):
+    """ Returns one good quest and one without a title. """
+
+    def generate(self, model, contents):
+        return StubResponse(json.dumps([QUEST_A, {"name": "x"}]))
+
+
+def test_batch_replaces_incomplete_quests_with_fallback(tmp_path, monkeypatch):
+    quest_generator = pytest.importorskip("src.quest_generator")
+    monkeypatch.setattr(quest_generator, "QUESTS_DIR", str(tmp_path))
+    monkeypatch.setattr(quest_generator, "db_collection", None)
+
+    generator = quest_generator.QuestGenerator(model_client=PartialBatchClient())
+    quests = generator.generate_quests_batch([STATE, STATE])
+    assert quests[0]["title"] == QUEST_A["title"]
+    assert quests[1]["type"] == "Fallback Mechanism"
+
+
+class MeteredClient(StubModelClient):
+    """ Attaches Gemini-style usage_metadata to every reply. """
+
+    def generate(self, model, contents):
+        response = super().generate(model, contents)
+        response.usage_metadata = SimpleNamespace(prompt_token_count=321, candidates_token_count=45)
+        return response
+
+
+def test_token_log_prefers_usage_metadata(tmp_path, monkeypatch):
+    quest_generator = pytest.importorskip("src.quest_generator")
+    monkeypatch.setattr(quest_generator, "QUESTS_DIR", str(tmp_path))
+    monkeypatch.setattr(quest_generator, "db_collection", None)
+
+    generator = quest_generator.QuestGenerator(model_client=MeteredClient())
+    generator.generate_quest(STATE)
+    entry = generator.token_log[-1]
+    assert (entry["token_source"], entry["prompt_tokens"], entry["response_tokens"]) == ("usage_metadata", 321, 45)
+    assert generator.token_stats()["estimated_requests"] == 0
+
+    stub = quest_generator.QuestGenerator(model_client=StubModelClient())
+    stub.generate_quest(STATE)
+    assert stub.token_log[-1]["token_source"] == "estimate"
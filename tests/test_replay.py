@@ -0,0 +1,70 @@
+import pytest
+
+from src.central_bank import CentralBankAI
+from src.economy import Economy
+from src.replay import SimulationRecorder
+
+
+class CountingQuestGenerator:
+    """ Stands in for QuestGenerator; counts how often the AI is called. """
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_quest(self, economy_state):
+        self.calls += 1
+        return {"title": f"Quest {self.calls}", "condition": economy_state["condition"]}
+
+
+def record_run(steps=100):
+    quests = CountingQuestGenerator()
+    recorder = SimulationRecorder(Economy(seed=7), CentralBankAI(), quests,
+                                  checkpoint_interval=10, faucet=1000)
+    return recorder, recorder.run(steps), quests
+
+
+def test_seek_matches_live_run():
+    recorder, live, quests = record_run()
+    calls = quests.calls
+
+    for target in (57, 10, 90, 100, 1):
+        assert recorder.seek(target) == live[target - 1]
+
+    # Replay uses the recorded quests, never the AI
+    assert quests.calls == calls
+
+
+def test_seek_to_start_returns_initial_state():
+    recorder, _, _ = record_run()
+    state = recorder.seek(0)
+    assert state["step"] == 0
+    assert state["money_supply"] == 100_000_000
+
+
+def test_seek_past_recorded_end_raises():
+    recorder, _, _ = record_run()
+    with pytest.raises(ValueError):
+        recorder.seek(150)
+    with pytest.raises(ValueError):
+        recorder.seek(-1)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    recorder, live, quests = record_run()
+    path = tmp_path / "run.json"
+    recorder.save(path)
+
+    restored = SimulationRecorder(Economy(), CentralBankAI(), quests)
+    assert restored.load(path) == live[-1]
+    assert restored.step_count == 100
+    assert restored.seek(83) == live[82]
+    with pytest.raises(ValueError):
+        restored.seek(101)
+
+
+def test_recording_after_seek_starts_new_branch():
+    recorder, live, _ = record_run()
+    recorder.seek(40)
+    recorder.run(5)
+    assert recorder.end_step == 45
+    assert max(recorder.policy_log) == 45
@@ -0,0 +1,147 @@
+import random
+
+import pytest
+
+from src import sensitivity
+from src.central_bank import CentralBankAI
+from src.economy import Economy
+
+
+def legacy_decide_policy(strategy, economy):
+    """ The Hawk/Dove/Balanced branches as they were before STRATEGY_PROFILES. """
+    current = economy.money_supply
+    target = economy.inflation_target
+
+    if "Hawk" in strategy:
+        if current > target * 1.01:
+            economy.tax_rate = min(0.90, economy.tax_rate + 0.15)
+        elif current < target * 0.99:
+            economy.tax_rate = 0.01
+    elif "Dove" in strategy:
+        if current > target * 1.50:
+            economy.tax_rate = min(0.20, economy.tax_rate + 0.001)
+        elif current < target * 0.90:
+            economy.tax_rate = max(0.01, economy.tax_rate - 0.01)
+    else:
+        if current > target * 1.10:
+            economy.tax_rate = min(0.50, economy.tax_rate + 0.02)
+        elif current < target * 0.90:
+            economy.tax_rate = max(0.01, economy.tax_rate - 0.01)
+
+    return economy.tax_rate
+
+
+@pytest.mark.parametrize("strategy", [
+    "🦅 The Hawk (Aggressive)", "🕊️ The Dove (Conservative)", "⚖️ Balanced (Standard)", "🙈 Laissez-Faire (No AI)",
+])
+def test_profiles_match_legacy_branches(strategy):
+    rng = random.Random(0)
+    bank = CentralBankAI(strategy)
+    for _ in range(5000):
+        money = rng.randint(50_000_000, 200_000_000)
+        tax = rng.choice([rng.random(), 0.01, 0.2, 0.5, 0.9])
+        assert bank.decide_policy(Economy(money, tax)) == legacy_decide_policy(strategy, Economy(money, tax))
+
+
+def test_policy_overrides():
+    economy = Economy(start_money=200_000_000, start_tax=0.25)
+    assert CentralBankAI("Balanced", tax_cap=0.26).decide_policy(economy) == 0.26
+    with pytest.raises(ValueError):
+        CentralBankAI("Balanced", tax_capp=0.3)
+
+
+def reference_simulate(scenario):
+    """ The dashboard loop driven through the Economy and CentralBankAI objects. """
+    policy = {k: v for k, v in scenario.items() if k in sensitivity.POLICY_PARAMETERS}
+    world = Economy(start_money=scenario["start_money"], start_tax=scenario["start_tax"])
+    ai = CentralBankAI(scenario["strategy"], **policy)
+    rush_start = scenario["gold_rush_start"]
+    rush_end = rush_start + scenario["gold_rush_days"]
+    peak_money, max_tax = world.money_supply, world.tax_rate
+
+    for day in range(scenario["days"]):
+        rush = rush_start <= day <= rush_end
+        world.inject_money(scenario["daily_print"] * (scenario["gold_rush_intensity"] if rush else 1))
+        if day == scenario["whale_day"]:
+            world.inject_money(scenario["whale_amount"])
+        world.transaction(world.money_supply * scenario["trade_fraction"])
+        tax = ai.decide_policy(world)
+        peak_money = max(peak_money, world.money_supply)
+        max_tax = max(max_tax, tax)
+
+    target = world.inflation_target
+    return {
+        "peak_inflation": round((peak_money / target - 1.0) * 100, 2),
+        "final_inflation": round((world.money_supply / target - 1.0) * 100, 2),
+        "final_tax": round(world.tax_rate, 4),
+        "max_tax": round(max_tax, 4),
+    }
+
+
+@pytest.mark.parametrize("strategy", ["Hawk", "Dove", "Balanced"])
+def test_simulate_matches_object_loop(strategy):
+    rng = random.Random(1)
+    for _ in range(50):
+        scenario = {
+            **sensitivity.BASE_SCENARIO,
+            "strategy": strategy,
+            "daily_print": rng.choice([10_000, 1_000_000, 3_000_000]),
+            "gold_rush_intensity": rng.choice([1.0, 2.5, 5]),
+            "whale_day": rng.choice([-1, 50, 200]),
+            "whale_amount": rng.choice([0, 50_000_000]),
+            "start_money": rng.randint(50_000_000, 150_000_000),
+            "tax_cap": rng.uniform(0.05, 0.9),
+            "raise_step": rng.uniform(0.001, 0.2),
+        }
+        assert sensitivity.simulate(scenario) == reference_simulate(scenario)
+
+
+RANGES = {"tax_cap": [0.01, 0.05, 0.1], "upper_band": [1.0, 1.3, 1.6], "daily_print": [100_000, 2_000_000]}
+
+
+def test_evaluate_grid_smoke():
+    result = sensitivity.evaluate_grid(RANGES, workers=1)
+    assert len(result["points"]) == len(result["stable_mask"]) == 18
+    assert len(result["surface"]["peak_inflation"]) == 18
+    assert result["stable_points"] == sum(result["stable_mask"])
+
+    # Every value reported in always_stable really is stable across the grid
+    for name, values in result["always_stable"].items():
+        for value in values:
+            assert all(p["stable"] for p in result["points"] if p[name] == value)
+
+    again = sensitivity.evaluate_grid(RANGES, workers=1)
+    assert again["evaluated"] == 0
+    assert again["points"] == result["points"]
+
+
+def test_evaluate_grid_rejects_unknown_parameters():
+    with pytest.raises(ValueError, match="Unknown parameter"):
+        sensitivity.evaluate_grid({"tax_capp": [0.1]})
+    with pytest.raises(ValueError, match="Unknown base parameter"):
+        sensitivity.evaluate_grid({"tax_cap": [0.1]}, base={"gold_rush_intensty": 5})
+
+
+def test_evaluate_grid_rejects_huge_grids():
+    huge = {"start": 0.0, "stop": 1.0, "steps": 100_000}
+    with pytest.raises(ValueError, match="too large"):
+        sensitivity.evaluate_grid({"tax_cap": huge, "raise_step": huge})
+    with pytest.raises(ValueError, match="too large"):
+        sensitivity.evaluate_grid({"tax_cap": [0.1, 0.2, 0.3]}, max_points=2)
+
+
+def test_evaluate_grid_defaults_missing_steps():
+    result = sensitivity.evaluate_grid({"tax_cap": {"start": 0.2, "stop": 0.4}}, workers=1)
+    assert result["axes"]["tax_cap"] == [0.2, 0.4]
+
+
+@pytest.mark.parametrize("spec, message", [
+    ({"stop": 0.9, "steps": 3}, "needs start"),
+    ({"start": 0.1, "stop": "high"}, "stop must be a number"),
+    ({"start": 0.1, "stop": 0.9, "steps": "many"}, "steps must be a whole number"),
+    ({"start": 0.1, "stop": 0.9, "steps": 2.5}, "steps must be a whole number"),
+    ([0.1, {"x": 1}], "values must be numbers or strings"),
+])
+def test_evaluate_grid_rejects_malformed_ranges(spec, message):
+    with pytest.raises(ValueError, match=message):
+        sensitivity.evaluate_grid({"tax_cap": spec}, workers=1)